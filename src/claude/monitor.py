@@ -7,10 +7,14 @@ Features:
 - Bash directory boundary enforcement
 """
 
+import asyncio
+import functools
+import os
+import re
 import shlex
 from collections import defaultdict
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
 import structlog
 
@@ -20,50 +24,104 @@ from ..security.validators import SecurityValidator
 logger = structlog.get_logger()
 
 # Commands that modify the filesystem and should have paths checked
-_FS_MODIFYING_COMMANDS: Set[str] = {
-    "mkdir",
-    "touch",
-    "cp",
-    "mv",
-    "rm",
-    "rmdir",
-    "ln",
-    "install",
-    "tee",
-}
+_FS_MODIFYING_COMMANDS: FrozenSet[str] = frozenset(
+    {
+        "mkdir",
+        "touch",
+        "cp",
+        "mv",
+        "rm",
+        "rmdir",
+        "ln",
+        "install",
+        "tee",
+    }
+)
 
 # Commands that are read-only or don't take filesystem paths
-_READ_ONLY_COMMANDS: Set[str] = {
-    "cat",
-    "ls",
-    "head",
-    "tail",
-    "less",
-    "more",
-    "which",
-    "whoami",
-    "pwd",
-    "echo",
-    "printf",
-    "env",
-    "printenv",
-    "date",
-    "wc",
-    "sort",
-    "uniq",
-    "diff",
-    "file",
-    "stat",
-    "du",
-    "df",
-    "tree",
-    "realpath",
-    "dirname",
-    "basename",
-}
+_READ_ONLY_COMMANDS: FrozenSet[str] = frozenset(
+    {
+        "cat",
+        "ls",
+        "head",
+        "tail",
+        "less",
+        "more",
+        "which",
+        "whoami",
+        "pwd",
+        "echo",
+        "printf",
+        "env",
+        "printenv",
+        "date",
+        "wc",
+        "sort",
+        "uniq",
+        "diff",
+        "file",
+        "stat",
+        "du",
+        "df",
+        "tree",
+        "realpath",
+        "dirname",
+        "basename",
+    }
+)
 
 # Actions / expressions that make ``find`` a filesystem-modifying command
-_FIND_MUTATING_ACTIONS: Set[str] = {"-delete", "-exec", "-execdir", "-ok", "-okdir"}
+_FIND_MUTATING_ACTIONS: FrozenSet[str] = frozenset(
+    {"-delete", "-exec", "-execdir", "-ok", "-okdir"}
+)
+
+# Single lookup table classifying a base command; unknown commands map to None
+_COMMAND_CLASS: Dict[str, str] = {
+    **{c: "ro" for c in _READ_ONLY_COMMANDS},
+    **{c: "fs" for c in _FS_MODIFYING_COMMANDS},
+    "find": "find",
+}
+
+
+# Fast tokenizer for commands without backslashes.  Without escapes, POSIX
+# ``shlex.split`` reduces to: split on whitespace, where a word is made of
+# unquoted characters plus '...' and "..." segments, with the quotes removed.
+# Each alternative starts with a distinct character, so matching is linear.
+_FAST_WORD = r"""(?:[^ \t\r\n'"]|'[^']*'|"[^"]*")+"""
+_FAST_COMMAND_RE = re.compile(
+    rf"[ \t\r\n]*(?:{_FAST_WORD}(?:[ \t\r\n]+{_FAST_WORD})*)?[ \t\r\n]*"
+)
+_FAST_WORD_RE = re.compile(_FAST_WORD)
+_QUOTED_SEGMENT_RE = re.compile(r"'([^']*)'" r'|"([^"]*)"')
+
+
+def _unquote(match: "re.Match[str]") -> str:
+    single, double = match.groups()
+    return single if single is not None else double
+
+
+def _split_command(command: str) -> List[str]:
+    """Split a command like ``shlex.split``, using compiled regexes when possible.
+
+    Falls back to ``shlex.split`` for commands with escapes or unbalanced
+    quotes, so behaviour (including the ``ValueError``) is unchanged.
+    """
+    if "\\" in command or not _FAST_COMMAND_RE.fullmatch(command):
+        return shlex.split(command)
+    return [
+        _QUOTED_SEGMENT_RE.sub(_unquote, word) if "'" in word or '"' in word else word
+        for word in _FAST_WORD_RE.findall(command)
+    ]
+
+
+# Commands longer than this are tokenized off the event loop
+_ASYNC_SPLIT_THRESHOLD = 2048
+
+
+@functools.lru_cache(maxsize=64)
+def _resolve_cached(path: Path) -> str:
+    """Resolve a stable directory (e.g. the approved directory) once."""
+    return os.path.realpath(path)
 
 
 def check_bash_directory_boundary(
@@ -77,50 +135,81 @@ def check_bash_directory_boundary(
     attempts to write outside the approved directory boundary.
     """
     try:
-        tokens = shlex.split(command)
+        tokens = _split_command(command)
     except ValueError:
         # If we can't parse the command, let it through —
         # the sandbox will catch it at the OS level
         return True, None
 
+    return _check_tokens_boundary(tokens, working_directory, approved_directory)
+
+
+async def check_bash_directory_boundary_async(
+    command: str,
+    working_directory: Path,
+    approved_directory: Path,
+) -> Tuple[bool, Optional[str]]:
+    """Async variant of ``check_bash_directory_boundary``.
+
+    Very long commands (heredocs, hundreds of arguments) are tokenized in a
+    worker thread so parsing does not stall the event loop.
+    """
+    if len(command) <= _ASYNC_SPLIT_THRESHOLD:
+        return check_bash_directory_boundary(
+            command, working_directory, approved_directory
+        )
+
+    try:
+        tokens = await asyncio.to_thread(_split_command, command)
+    except ValueError:
+        return True, None
+
+    return _check_tokens_boundary(tokens, working_directory, approved_directory)
+
+
+def _check_tokens_boundary(
+    tokens: List[str],
+    working_directory: Path,
+    approved_directory: Path,
+) -> Tuple[bool, Optional[str]]:
+    """Boundary check on an already tokenized command."""
     if not tokens:
         return True, None
 
     base_command = Path(tokens[0]).name
 
-    # Read-only commands are always allowed
-    if base_command in _READ_ONLY_COMMANDS:
+    command_class = _COMMAND_CLASS.get(base_command)
+
+    # Only filesystem-modifying commands are checked; read-only and unknown
+    # commands are always allowed
+    if command_class is None or command_class == "ro":
         return True, None
 
     # Handle ``find`` specially: only dangerous when it contains mutating actions
-    if base_command == "find":
-        has_mutating_action = any(t in _FIND_MUTATING_ACTIONS for t in tokens[1:])
-        if not has_mutating_action:
-            return True, None
-        # Fall through to path checking below
-    elif base_command not in _FS_MODIFYING_COMMANDS:
-        # Only check filesystem-modifying commands
+    if command_class == "find" and _FIND_MUTATING_ACTIONS.isdisjoint(tokens[1:]):
         return True, None
 
-    # Check each argument for paths outside the boundary
-    resolved_approved = approved_directory.resolve()
+    # Flags never name paths; if nothing else is left (``rm --help``),
+    # there is nothing to resolve.
+    path_tokens = [t for t in tokens[1:] if not t.startswith("-")]
+    if not path_tokens:
+        return True, None
 
-    for token in tokens[1:]:
-        # Skip flags
-        if token.startswith("-"):
-            continue
+    # Check each argument for paths outside the boundary.  Containment is a
+    # string-prefix test on real paths; the trailing separator keeps
+    # ``/approved-other`` from matching ``/approved``.
+    resolved_approved = _resolve_cached(approved_directory)
+    approved_prefix = resolved_approved.rstrip(os.sep) + os.sep
+    working_dir = str(working_directory)
 
+    for token in path_tokens:
         # Resolve both absolute and relative paths against the working
         # directory so that traversal sequences like ``../../evil`` are
-        # caught instead of being silently allowed.
-        if token.startswith("/"):
-            resolved = Path(token).resolve()
-        else:
-            resolved = (working_directory / token).resolve()
-
-        try:
-            resolved.relative_to(resolved_approved)
-        except ValueError:
+        # caught instead of being silently allowed.  ``os.path.join``
+        # returns absolute tokens unchanged.
+        resolved = os.path.realpath(os.path.join(working_dir, token))
+
+        if not (resolved + os.sep).startswith(approved_prefix):
             return False, (
                 f"Directory boundary violation: '{base_command}' targets "
                 f"'{token}' which is outside approved directory "
@@ -275,7 +364,7 @@ class ToolMonitor:
                     return False, f"Dangerous command pattern detected: {pattern}"
 
             # Check directory boundary for filesystem-modifying commands
-            valid, error = check_bash_directory_boundary(
+            valid, error = await check_bash_directory_boundary_async(
                 command, working_directory, self.config.approved_directory
             )
             if not valid:
@@ -1,10 +1,16 @@
 """Test Claude tool monitor — especially bash directory boundary checking."""
 
+import shlex
 from pathlib import Path
 
 import pytest
 
-from src.claude.monitor import ToolMonitor, check_bash_directory_boundary
+from src.claude.monitor import (
+    ToolMonitor,
+    _split_command,
+    check_bash_directory_boundary,
+    check_bash_directory_boundary_async,
+)
 from src.config.settings import Settings
 
 
@@ -109,6 +115,12 @@ class TestCheckBashDirectoryBoundary:
         assert valid
         assert error is None
 
+    def test_flags_only_command_passes(self) -> None:
+        for cmd in ["rm --help", "mv --version", "mkdir -p"]:
+            valid, error = check_bash_directory_boundary(cmd, self.cwd, self.approved)
+            assert valid, f"Expected flags-only command to pass: {cmd}"
+            assert error is None
+
     def test_unparseable_command_passes_through(self) -> None:
         """Malformed quoting should pass through (sandbox catches it at OS level)."""
         valid, error = check_bash_directory_boundary(
@@ -184,6 +196,141 @@ class TestCheckBashDirectoryBoundary:
         assert not valid
         assert "/etc" in error
 
+    def test_sibling_with_shared_prefix_is_outside(self) -> None:
+        """/root/projects-evil is not inside /root/projects."""
+        valid, error = check_bash_directory_boundary(
+            "touch /root/projects-evil/file", self.cwd, self.approved
+        )
+        assert not valid
+        assert "/root/projects-evil/file" in error
+
+    def test_approved_directory_itself_is_inside(self) -> None:
+        valid, error = check_bash_directory_boundary(
+            "touch /root/projects", self.cwd, self.approved
+        )
+        assert valid
+        assert error is None
+
+    def test_symlinked_approved_directory_uses_real_path(self, tmp_path: Path) -> None:
+        """A symlinked approved directory is enforced against its real path."""
+        real = tmp_path / "real"
+        real.mkdir()
+        (tmp_path / "outside").mkdir()
+        approved = tmp_path / "approved-link"
+        approved.symlink_to(real)
+
+        for _ in range(2):
+            valid, error = check_bash_directory_boundary(
+                f"touch {real}/file", approved, approved
+            )
+            assert valid
+            assert error is None
+
+            valid, error = check_bash_directory_boundary(
+                "touch ../outside/file", approved, approved
+            )
+            assert not valid
+            assert "directory boundary violation" in error.lower()
+
+
+class TestCheckBashDirectoryBoundaryAsync:
+    """Test the async variant used by ToolMonitor."""
+
+    approved = Path("/root/projects")
+    cwd = Path("/root/projects/myapp")
+
+    async def test_short_command_matches_sync(self) -> None:
+        valid, error = await check_bash_directory_boundary_async(
+            "touch /tmp/evil.txt", self.cwd, self.approved
+        )
+        assert not valid
+        assert "/tmp/evil.txt" in error
+
+    async def test_long_command_outside_approved_directory(self) -> None:
+        args = " ".join(f"file{i}.txt" for i in range(400))
+        valid, error = await check_bash_directory_boundary_async(
+            f"touch {args} /tmp/evil.txt", self.cwd, self.approved
+        )
+        assert not valid
+        assert "/tmp/evil.txt" in error
+
+    async def test_long_command_inside_approved_directory(self) -> None:
+        args = " ".join(f"file{i}.txt" for i in range(400))
+        valid, error = await check_bash_directory_boundary_async(
+            f"touch {args}", self.cwd, self.approved
+        )
+        assert valid
+        assert error is None
+
+    async def test_long_unparseable_command_passes_through(self) -> None:
+        valid, error = await check_bash_directory_boundary_async(
+            "mkdir 'unclosed " + "x" * 4096, self.cwd, self.approved
+        )
+        assert valid
+        assert error is None
+
+
+class TestSymlinkedArguments:
+    """Any non-flag argument may be a symlink, whatever it looks like."""
+
+    @pytest.mark.parametrize("name", ["0755", "FOO=bar", "@@", "{}", ";", "src"])
+    def test_symlink_escaping_approved_directory(
+        self, tmp_path: Path, name: str
+    ) -> None:
+        approved = tmp_path / "approved"
+        outside = tmp_path / "outside"
+        approved.mkdir()
+        outside.mkdir()
+        (approved / name).symlink_to(outside)
+
+        valid, error = check_bash_directory_boundary(
+            f"cp x '{name}'", approved, approved
+        )
+        assert not valid
+        assert "directory boundary violation" in error.lower()
+
+    def test_retargeted_symlink_is_rechecked(self, tmp_path: Path) -> None:
+        """A directory replaced by an escaping symlink is caught immediately."""
+        approved = tmp_path / "approved"
+        outside = tmp_path / "outside"
+        target = approved / "d"
+        target.mkdir(parents=True)
+        outside.mkdir()
+
+        valid, _ = check_bash_directory_boundary("cp x d", approved, approved)
+        assert valid
+
+        target.rmdir()
+        target.symlink_to(outside)
+        valid, error = check_bash_directory_boundary("cp x d", approved, approved)
+        assert not valid
+        assert "directory boundary violation" in error.lower()
+
+
+class TestSplitCommand:
+    """The fast tokenizer must agree with shlex.split."""
+
+    @pytest.mark.parametrize(
+        "command",
+        [
+            "",
+            "mkdir -p /root/projects/dir",
+            "rm 'a b' \"c d\"",
+            "touch x'y z'\"w\"",
+            "cp '' \"\" dest",
+            'echo "it\'s" \'say "hi"\'',
+            "mv a\tb\nc",
+            "find . -exec rm {} ;",
+            "rm a\\ b",
+        ],
+    )
+    def test_matches_shlex(self, command: str) -> None:
+        assert _split_command(command) == shlex.split(command)
+
+    def test_unbalanced_quote_raises(self) -> None:
+        with pytest.raises(ValueError):
+            _split_command("mkdir 'unclosed quote")
+
 
 class TestToolMonitorBashBoundary:
     """Test that validate_tool_call wires up the bash directory boundary check."""